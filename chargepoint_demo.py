@@ -15,14 +15,18 @@ ticks, and shows the board
 the grid size necessary to hold the pattern. We have 
 implemented an infinite grid. (other choices in grid design 
 such as endless, fixed, etc.) 
+- SparseGrid and HashLifeGrid classes, also infinite grids,
+which keep only the live cells (HashLifeGrid as a memoized
+quadtree) - for mostly dead grids and repeating patterns.
 - GridCell and GridPoint classes, represent a cell in grid with 
-live/dead state and a point to represent any grid cell.
+live/dead state and a point to represent any grid cell. The
+grids themselves work on arrays of cells; these are kept for
+code that works with Pattern cells one point at a time.
 - Pattern is a helper class, to translate a shorthand 
-notation of a pattern of a rectangular grid into a set of 
-live points. We got a bunch of test patterns from wikipedia.
+notation of a pattern of a rectangular grid into a mask of 
+live cells. We got a bunch of test patterns from wikipedia.
 """
 
-print("Hello, chargepoint!")
 gPatternDict = { "block": "XX/XX", 
                 "blink": "XXX", 
                 "bounce": "XX/XX/..XX/..XX", 
@@ -78,36 +82,39 @@ class GridPoint:
 # takes a "/"-joined set of row descriptions of a rect grid
 # where each row is described as a seq of dead (space,dot)
 # or alive (any other char) cells.
-# In essence it translates the pattern into a set of Points
-# that are alive
+# In essence it translates the pattern into a mask of the
+# cells that are alive, located at an origin (row,col)
 ###########################################################
 #
-import itertools
+import numpy as np
+
 class Pattern:
+    # byte translation table from a pattern char to a cell state, 1=alive and 0=dead
+    charStates = bytes(0 if ch in b". " else 1 for ch in range(256))
     def __init__(self, pattern=""):
-        def _mkPoint(r,c,val):
-            return GridPoint(r,c,GridCell.fromChar(val).isAlive())
         rows = pattern.strip("/").split("/")
-        all_points = ((map( lambda val,col: _mkPoint(r,col,val), rows[r], range(len(rows[r])) )) for r in range(len(rows)))
-        self.points = list(itertools.chain.from_iterable( all_points ))
-        # print("Pattern points -- ", len(self.points), self.points)
+        maxcol = max(len(row) for row in rows)
+        # the rows are laid out in one flat byte buffer, one byte per char (non ascii chars
+        # become "?", i.e. alive), which is translated to cell states all in one go
+        cells = "".join(row.ljust(maxcol) for row in rows).encode("ascii", "replace")
+        self.mask = np.frombuffer(cells.translate(Pattern.charStates), dtype=np.uint8).reshape(len(rows), maxcol)
+        self.origin = (0, 0)
+        # print("Pattern mask -- ", self.mask.shape, self.mask)
 
 
+    # return (rows, cols) arrays with the row and col of each live point
     def getPoints(self):
-        return self.points
+        rows, cols = np.nonzero(self.mask)
+        return rows + self.origin[0], cols + self.origin[1]
 
 
+    # return the last row and column of the pattern
     def getExtent(self):
-        maxrow, maxcol = 0,0
-        for p in self.points:
-            maxrow = max(maxrow, p.row)
-            maxcol = max(maxcol, p.col)
-        return maxrow, maxcol
+        return self.origin[0] + self.mask.shape[0] - 1, self.origin[1] + self.mask.shape[1] - 1
 
 
     def moveBy(self, howmuch=[0,0]):
-        for p in self.points:
-            p.moveBy(howmuch)
+        self.origin = (self.origin[0] + howmuch[0], self.origin[1] + howmuch[1])
 #
 ###########################################################
 # Grid
@@ -128,66 +135,156 @@ class Pattern:
 #
 class Grid:
     directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+    # byte translation table from a cell state to its display char
+    cellChars = bytes.maketrans(b"\x00\x01\x02", b".X\n")
     def __init__(self, gridType, extent, margins):
+        Grid.checkLayout(gridType, extent, margins)
+        self.extent = extent
+        self.margins = margins
+        # an empty board of cells, 1=alive and 0=dead. the front board holds the
+        # current state, the back board is where the next state gets computed.
+        # both have a permanent dead border of 1 cell on each side, so that
+        # neighbors of any grid cell can be read without checking bounds
+        self.front = np.zeros((self.extent[0]+2, self.extent[1]+2), dtype=np.uint8)
+        self.back = np.zeros_like(self.front)
+        # bounds of living cells, kept up to date as the grid changes.
+        # when no cell is alive, top/left are past the grid and bottom/right on its last row/column
+        self.live_top, self.live_bottom = self.extent[0], self.extent[0] - 1
+        self.live_left, self.live_right = self.extent[1], self.extent[1] - 1
+
+
+    # validate the grid type, extent and margins a grid is asked to have
+    @staticmethod
+    def checkLayout(gridType, extent, margins):
         if gridType != "inf":
-            raise BaseException(f"bad grid type, only inf is allowed.")
+            raise ValueError(f"bad grid type, only inf is allowed.")
         if any(map(lambda x: x < 1, margins)):
-            raise BaseException(f"bad grid margins, minimum 1 on each side needed!")
+            raise ValueError(f"bad grid margins, minimum 1 on each side needed!")
         if extent[0] < (margins[0]+margins[2]) or extent[1] < (margins[1]+margins[3]):
-            raise BaseException(f"bad grid extents, must be larger than margins!!")
-        self.extent = extent
-        self.margins = margins
-        # an empty set of rows of cells
-        self.rows = [ [GridCell()] * self.extent[1] for i in range(self.extent[0]) ]
+            raise ValueError(f"bad grid extents, must be larger than margins!!")
+
+
+    # the current state of the grid, without the border
+    @property
+    def board(self):
+        return self.front[1:-1, 1:-1]
 
 
     def seedPattern(self, initialPattern, initialLocation="center"):
         if initialLocation != "center":
-            raise BaseException(f"bad pattern location!")
+            raise ValueError(f"bad pattern location!")
         p = Pattern(initialPattern)        
+        # a pattern larger than the grid (with its margins) has the grid grow to hold it.
+        # the rows/columns are added at south and east, so the live bounds stay put
+        grow_S = max(p.mask.shape[0] + self.margins[0] + self.margins[2] - self.extent[0], 0)
+        grow_E = max(p.mask.shape[1] + self.margins[1] + self.margins[3] - self.extent[1], 0)
+        if grow_S or grow_E:
+            self.front = np.pad(self.front, ((0, grow_S), (0, grow_E)))
+            self.back = np.pad(self.back, ((0, grow_S), (0, grow_E)))
+            self.extent[0], self.extent[1] = self.board.shape
+            if self.live_top > self.live_bottom:
+                self.live_top, self.live_bottom = self.extent[0], self.extent[0] - 1
+                self.live_left, self.live_right = self.extent[1], self.extent[1] - 1
         pextent = p.getExtent()
         moveBy = list( (self.extent[x] - pextent[x]) // 2 for x in range(2) )
         p.moveBy(moveBy)
-        self.applyPoints(p.getPoints(), trim_now=False)
+        rows, cols = p.getPoints()
+        self.applyPoints(rows, cols, 1, trim_now=False)
 
 
     # produce a plane vanilla displayable grid
     def __str__(self):
-        x = "\n".join( 
-                    "".join(repr(self.rows[r][c])  for c in range(len(self.rows[r]))) 
-                    for r in range(len(self.rows)) )
-        y = ",".join((str(n) for n in self.extent))
+        return Grid.boardToString(self.board)
+
+
+    # display a board of cells, along with its size. each row gets an extra
+    # cell of state 2 for its line end, so that all of the board is translated
+    # into chars in one go (0 to ".", 1 to "X", 2 to newline)
+    @staticmethod
+    def boardToString(board):
+        lines = np.pad(board, ((0, 0), (0, 1)), constant_values=2)
+        x = lines.tobytes().translate(Grid.cellChars).decode("ascii")[:-1]
+        y = ",".join((str(n) for n in board.shape))
         return f"{x}\nsize=({y})"
 
 
-    # superimpose the state from given set of points to the grid
+    # superimpose the state given as (rows, cols, vals) arrays onto the grid
     # then, maintain the margins
-    def applyPoints(self, points, trim_now=True):
+    def applyPoints(self, rows, cols, vals, trim_now=True):
         # update the grid
-        for x in points:
-            self.rows[x.row][x.col] = x.state
+        rows, cols, vals = np.broadcast_arrays(rows, cols, vals)
+        # negative rows/columns would wrap around to the other edge of the board
+        if len(rows) and (rows.min() < 0 or rows.max() >= self.extent[0] or cols.min() < 0 or cols.max() >= self.extent[1]):
+            raise ValueError(f"bad points, must be within the grid extents!")
+        self.board[rows, cols] = vals
+        # live bounds grow to take in the births, and shrink where the edges died
+        born = vals != 0
+        if born.any():
+            top, bottom = rows[born].min(), rows[born].max()
+            left, right = cols[born].min(), cols[born].max()
+            if self.live_top <= self.live_bottom:
+                top, bottom = min(top, self.live_top), max(bottom, self.live_bottom)
+                left, right = min(left, self.live_left), max(right, self.live_right)
+            self._shrinkLiveBounds(top, bottom, left, right)
+        elif self.live_top <= self.live_bottom:
+            self._shrinkLiveBounds(self.live_top, self.live_bottom, self.live_left, self.live_right)
         self._maintainMargin(trim_now)
 
 
-    # test and apply margin requirements by
-    # - counting the current "dead" rows and columns at extremes
-    def _maintainMargin(self, trim_now=True):
-        def __testRowIsDead(r):
-            return not list(filter(lambda c: self.isCellAlive(r,c), range(self.extent[1])))
-        def __testColumnIsDead(c):
-            return not list(filter(lambda r: self.isCellAlive(r,c), range(self.extent[0])))
-        def __computeDeficits():
-            # - what are the bounds of living cells?
-            top, bottom = 0, self.extent[0] - 1 # index where first live row
-            left, right = 0, self.extent[1] - 1 # index where first live column
-            while (top < self.extent[0]) and __testRowIsDead(top):
-                top += 1 # move towards south
-            while (bottom < self.extent[0]) and (bottom > top) and __testRowIsDead(bottom):
+    # make the back board, where the next state has been computed, the current state
+    # then, maintain the margins
+    def swapBoards(self, trim_now=True):
+        self.front, self.back = self.back, self.front
+        # in a tick, births happen only right next to live cells, so the
+        # live bounds can only grow by 1 on each side. or shrink
+        if self.live_top <= self.live_bottom:
+            self._shrinkLiveBounds(max(self.live_top - 1, 0), min(self.live_bottom + 1, self.extent[0] - 1),
+                                    max(self.live_left - 1, 0), min(self.live_right + 1, self.extent[1] - 1))
+        self._maintainMargin(trim_now)
+
+
+    # set the live bounds given bounds that cover all living cells: each edge
+    # moves inwards as long as its row/column is dead within the bounds
+    def _shrinkLiveBounds(self, top, bottom, left, right):
+        B = self.board
+        while top <= bottom and not B[top, left:right+1].any():
+            top += 1 # move towards south
+        if top > bottom: # no cell is alive
+            top, bottom, left, right = self.extent[0], self.extent[0] - 1, self.extent[1], self.extent[1] - 1
+        else:
+            while not B[bottom, left:right+1].any():
                 bottom -= 1 # move north
-            while (left < self.extent[1]) and __testColumnIsDead(left):
+            while not B[top:bottom+1, left].any():
                 left += 1 # move east
-            while (right < self.extent[1]) and (right > left) and __testColumnIsDead(right):
+            while not B[top:bottom+1, right].any():
                 right -= 1 # move west
+        self.live_top, self.live_bottom, self.live_left, self.live_right = top, bottom, left, right
+
+
+    # the board packed into uint64 words, 64 cells per word along a row.
+    # cell (r,c) is bit c%64 of word [r, c//64]; unused bits of the last word are dead
+    @property
+    def board_packed(self):
+        rowcount, colcount = self.board.shape
+        cells = np.zeros((rowcount, -(-colcount // 64) * 64), dtype=np.uint8)
+        cells[:, :colcount] = self.board
+        return np.packbits(cells, axis=1, bitorder="little").view("<u8")
+
+
+    # unpack a board packed the way board_packed does it into the back board,
+    # and make it the current state
+    def applyPacked(self, packed, trim_now=True):
+        self.back[1:-1, 1:-1] = np.unpackbits(packed.view(np.uint8), axis=1, count=self.extent[1], bitorder="little")
+        self.swapBoards(trim_now)
+
+
+    # test and apply margin requirements by
+    # - comparing the current "dead" rows and columns at extremes with the margins
+    def _maintainMargin(self, trim_now=True):
+        def __computeDeficits():
+            # - what are the bounds of living cells? (kept up to date already)
+            top, bottom = self.live_top, self.live_bottom
+            left, right = self.live_left, self.live_right
             # print(f"margin test - starting bounds {top}, {right}, {bottom}, {left}")
             # - what's the deficiency/excess w.r.t. desired margins?
             # (staying with N S E W metaphors)
@@ -198,74 +295,69 @@ class Grid:
             # print(f" - calculated deficits N E S W {deficit_N} {deficit_E} {deficit_S} {deficit_W}")
             return deficit_N, deficit_E, deficit_S, deficit_W
 
-        # helpers in add/trim action. deficit when -ve means drop row/column; when +ve means add row/column
-        def __addARow(i): 
-            self.rows.insert(i, [GridCell()] * self.extent[1])
-        def __trimARow(i): 
-            self.rows.pop(i) 
-        def __addAColumn(i):
-            for r in range(self.extent[0]):
-                self.rows[r].insert(i, GridCell())
-        def __trimAColumn(i):
-            for r in range(self.extent[0]):
-                self.rows[r].pop(i)
-
         # - what are the bounds of living cells? what's the gap vis a vis margin requirements
         deficit_N, deficit_E, deficit_S, deficit_W = __computeDeficits()
-        # remedying the deficits...
-        # -- working on Rows - north end
-        for i in range(abs(deficit_N)):
-            if deficit_N > 0:
-                __addARow(0)
-            elif trim_now:
-                __trimARow(0)
-        self.extent[0] = len(self.rows) # update live bounds
-        # -- rows, south end
-        for i in range(abs(deficit_S)):
-            if deficit_S > 0:
-                __addARow(len(self.rows))
-            elif trim_now:
-                self.rows.pop(len(self.rows)-1)
-        self.extent[0] = len(self.rows) # update live bounds
-        # -- working on Columns, west end first
-        for i in range(abs(deficit_W)):
-            if deficit_W > 0:
-                __addAColumn(0)
-            elif trim_now:
-                __trimAColumn(0)
-        self.extent[1] = len(self.rows[0]) # update live bounds
-        # -- columns, east end
-        for i in range(abs(deficit_E)):
-            if deficit_E > 0:
-                __addAColumn(len(self.rows[0]))
-            elif trim_now:
-                __trimAColumn(len(self.rows[0])-1)
-        self.extent[1] = len(self.rows[0]) # update live bounds
+        # remedying the deficits... deficit when -ve means drop rows/columns; when +ve means add.
+        # all four sides are trimmed with one slice, and then all four sides are
+        # added with one pad (one allocation and copy). a trim that is not followed
+        # by a pad gets copied, so that the boards stay C-contiguous for the kernels.
+        # both the boards are resized alike - the back board is only scratch space though.
+        # rows/columns added or trimmed at the edges of the front board are dead, so its border
+        # stays dead. the back board though still holds the previous generation, in which the
+        # row/column that becomes its new border may have been alive - so that border is cleared
+        deficits = (deficit_N, deficit_S, deficit_W, deficit_E)
+        add_N, add_S, add_W, add_E = (max(d, 0) for d in deficits)
+        cut_N, cut_S, cut_W, cut_E = (max(-d, 0) if trim_now else 0 for d in deficits)
+        def __resize(f):
+            self.front, self.back = f(self.front), f(self.back)
+        if cut_N or cut_S or cut_W or cut_E:
+            __resize(lambda b: b[cut_N:b.shape[0]-cut_S, cut_W:b.shape[1]-cut_E])
+        if add_N or add_S or add_W or add_E:
+            __resize(lambda b: np.pad(b, ((add_N, add_S), (add_W, add_E))))
+        elif cut_N or cut_S or cut_W or cut_E:
+            __resize(np.ascontiguousarray)
+        if cut_N or cut_S or cut_W or cut_E:
+            self.back[[0, -1], :] = 0
+            self.back[:, [0, -1]] = 0
+        self.extent[0], self.extent[1] = self.board.shape # update grid extent
+        # - the live bounds move along with the rows and columns added/trimmed at north and west
+        if self.live_top <= self.live_bottom:
+            self.live_top += add_N - cut_N
+            self.live_bottom += add_N - cut_N
+            self.live_left += add_W - cut_W
+            self.live_right += add_W - cut_W
+        else:
+            self.live_top, self.live_bottom = self.extent[0], self.extent[0] - 1
+            self.live_left, self.live_right = self.extent[1], self.extent[1] - 1
 
 
     # tell if a cell is alive or dead
     def isCellAlive(self, r, c):
-        return self.rows[r][c].isAlive()
+        return bool(self.front[r+1, c+1])
 
 
-    # return a row vector with count of alive neighbors for a specific row in the grid 
-    def countNeighborsForRow(self, row):
-        n = list(map( lambda col: self._countNeighborsCell(row,col), range(self.extent[1]) ))
-        return n
+    # return a board-sized array with count of alive neighbors for every cell in the grid.
+    # the 8 shifted views of the bordered board are summed up
+    def countNeighbors(self):
+        B = self.front
+        return (B[:-2, :-2] + B[:-2, 1:-1] + B[:-2, 2:] +
+                B[1:-1, :-2]               + B[1:-1, 2:] +
+                B[2:, :-2]  + B[2:, 1:-1]  + B[2:, 2:])
 
 
     # return a count of alive neighbors for a speific cell in the grid
+    # (the dead border stands in for the cells beyond the boundaries)
     def _countNeighborsCell(self, r0, c0):
-        livings = list(filter (lambda s: self.getCell(s[0]+r0, s[1]+c0).isAlive(), Grid.directions))
-        return len(livings)
+        B, r, c = self.front, r0+1, c0+1
+        return int(B[r-1, c-1] + B[r-1, c] + B[r-1, c+1] + B[r, c-1] +
+                   B[r, c+1] + B[r+1, c-1] + B[r+1, c] + B[r+1, c+1])
 
 
     # return a cell from grid. if boundaries are crossed, return a dead cell
     def getCell(self, r, c):
-        try:
-            return self.rows[r][c]
-        except:
-            return GridCell() # a dead cell
+        if 0 <= r < self.extent[0] and 0 <= c < self.extent[1]:
+            return GridCell(self.isCellAlive(r, c))
+        return GridCell() # a dead cell
 
 
     # return the row x col spread of the grid
@@ -273,63 +365,569 @@ class Grid:
         return self.extent
 #
 ###########################################################
+# SparseGrid
+# also an INF grid, but one that keeps only the live cells, as
+# arrays of their rows and columns, instead of a board of all
+# cells. A tick costs in proportion to the live cells rather
+# than to the grid area, which suits mostly dead grids (gliders,
+# spaceships, expanding...). There are no rows or columns to
+# add or trim: the displayed grid is the bounding box of live
+# cells plus the margins, computed when asked for.
+###########################################################
+#
+class SparseGrid:
+    neighborRows, neighborCols = np.array(Grid.directions).T
+    def __init__(self, gridType, extent, margins):
+        Grid.checkLayout(gridType, extent, margins)
+        self.startExtent = extent
+        self.margins = margins
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.cols = np.zeros(0, dtype=np.int64)
+
+
+    def seedPattern(self, initialPattern, initialLocation="center"):
+        if initialLocation != "center":
+            raise ValueError(f"bad pattern location!")
+        p = Pattern(initialPattern)
+        pextent = p.getExtent()
+        moveBy = list( (self.startExtent[x] - pextent[x]) // 2 for x in range(2) )
+        p.moveBy(moveBy)
+        rows, cols = p.getPoints()
+        self.rows, self.cols = rows.astype(np.int64), cols.astype(np.int64)
+
+
+    # a cell (row,col) as one int64 key, for rows and cols within +-2**31
+    @staticmethod
+    def _toKeys(rows, cols):
+        return (rows << 32) + (cols + 2**31)
+    @staticmethod
+    def _fromKeys(keys):
+        return keys >> 32, (keys & 0xffffffff) - 2**31
+
+
+    # one round of game play: count alive neighbors of the cells next to live cells,
+    # then apply the game rules to just those cells
+    def step(self):
+        neighbors = SparseGrid._toKeys((self.rows[:, None] + SparseGrid.neighborRows).ravel(),
+                                        (self.cols[:, None] + SparseGrid.neighborCols).ravel())
+        cells, counts = np.unique(neighbors, return_counts=True)
+        alive = np.isin(cells, SparseGrid._toKeys(self.rows, self.cols))
+        self.rows, self.cols = SparseGrid._fromKeys(cells[(counts == 3) | (alive & (counts == 2))])
+
+
+    # the displayed board - bounding box of live cells, padded by the margins
+    @property
+    def board(self):
+        board = np.zeros(self.getExtent(), dtype=np.uint8)
+        if len(self.rows):
+            top, left = self._boardOrigin()
+            board[self.rows - top, self.cols - left] = 1
+        return board
+
+
+    # the (row,col) of the live cells that is the top left cell of the displayed board
+    def _boardOrigin(self):
+        return self.rows.min() - self.margins[0], self.cols.min() - self.margins[3]
+
+
+    def __str__(self):
+        return Grid.boardToString(self.board)
+
+
+    # tell if a cell (row,col of the displayed grid, as for Grid) is alive or dead
+    def isCellAlive(self, r, c):
+        if not len(self.rows):
+            return False
+        top, left = self._boardOrigin()
+        return bool(np.any((self.rows == r + top) & (self.cols == c + left)))
+
+
+    # return the row x col spread of the displayed grid
+    def getExtent(self):
+        rowcount, colcount = self.margins[0] + self.margins[2], self.margins[1] + self.margins[3]
+        if not len(self.rows):
+            return [rowcount, colcount]
+        return [int(self.rows.max() - self.rows.min()) + 1 + rowcount, int(self.cols.max() - self.cols.min()) + 1 + colcount]
+#
+###########################################################
+# HashLifeGrid
+# a SparseGrid played with Gosper's HashLife: the grid is a
+# quadtree of square nodes, level k covering 2^k x 2^k cells,
+# down to single cells at level 0. Nodes are hash-consed, i.e.
+# there is only one node for each (nw,ne,sw,se) of children,
+# so that the next generation of the center of a node can be
+# memoized per node. Periodic or repeating patterns (blink,
+# block, glider...) soon come down to cache lookups.
+###########################################################
+#
+class QuadNode:
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population")
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.level = level
+        self.population = population
+
+
+class HashLifeGrid(SparseGrid):
+    # past this many nodes and memoized generations, the caches get pruned
+    cacheLimit = 2**16
+    def __init__(self, gridType, extent, margins):
+        super().__init__(gridType, extent, margins)
+        self._dead, self._alive = QuadNode(None, None, None, None, 0, 0), QuadNode(None, None, None, None, 0, 1)
+        self._nodes = {} # (nw,ne,sw,se) -> the one node with those children
+        self._empties = [self._dead] # the empty node of each level
+        self._nexts = {} # node -> its center, one generation later
+        self._bounds = {} # node -> (top, left, bottom, right) of its live cells
+        # the root node, and the (row,col) of its nw corner
+        self.root, self.top, self.left = self._dead, 0, 0
+        self._cellsOf = None # the (root, top, left) that rows/cols were collected from
+
+
+    # the rows/cols of the live cells are collected from the root only when asked
+    # for (to display the grid), not on every tick. when set, they are taken as
+    # they are, until the root gets built from them
+    @property
+    def rows(self):
+        self._collectCells()
+        return self._rows
+    @rows.setter
+    def rows(self, rows):
+        self._rows, self._cellsOf = rows, None
+    @property
+    def cols(self):
+        self._collectCells()
+        return self._cols
+    @cols.setter
+    def cols(self, cols):
+        self._cols, self._cellsOf = cols, None
+
+    def _collectCells(self):
+        if self._cellsOf is not None and self._cellsOf != (self.root, self.top, self.left):
+            self._rows, self._cols = self._cells()
+            self._cellsOf = (self.root, self.top, self.left)
+
+
+    def seedPattern(self, initialPattern, initialLocation="center"):
+        super().seedPattern(initialPattern, initialLocation)
+        self._buildRoot()
+
+
+    # build the root as the smallest node that spans all the live cells,
+    # its nw corner at their top left
+    def _buildRoot(self):
+        rows, cols = self.rows, self.cols
+        self.top, self.left = (int(rows.min()), int(cols.min())) if len(rows) else (0, 0)
+        rows, cols = rows - self.top, cols - self.left
+        level = 3
+        while len(rows) and 2**level <= max(rows.max(), cols.max()):
+            level += 1
+        self.root = self._build(level, rows, cols)
+        self._cellsOf = (self.root, self.top, self.left)
+
+
+    # one round of game play: grow the root with empty borders until all live cells
+    # sit well within its center, then the next generation of the center is the new root.
+    # the new root is then cropped to its center for as long as that holds all live cells,
+    # so that it stays about as large as the live cells span (a glider would grow it forever).
+    # when the live cells have moved off the center (a glider again), cropping does not get
+    # it any smaller, so a root 8 times the span of the live cells is built anew around them.
+    # that is checked only when the root had to grow, from the memoized bounds of its live cells
+    def step(self):
+        grown = False
+        while self.root.level < 3 or not self._isPadded(self.root):
+            grown = True
+            half = 2**(self.root.level - 1)
+            self.root = self._expand(self.root)
+            self.top, self.left = self.top - half, self.left - half
+        quarter = 2**(self.root.level - 2)
+        self.root = self._next(self.root)
+        self.top, self.left = self.top + quarter, self.left + quarter
+        while self.root.level > 3 and self._isPadded(self.root):
+            quarter = 2**(self.root.level - 2)
+            self.root = self._center(self.root)
+            self.top, self.left = self.top + quarter, self.left + quarter
+        if grown and self.root.level > 3 and self.root.population:
+            top, left, bottom, right = self._liveBounds(self.root)
+            if 2**(self.root.level - 3) > max(bottom - top, right - left):
+                self._buildRoot()
+        self._pruneCaches()
+
+
+    # once the caches have grown past cacheLimit, keep only the nodes reachable from
+    # the root (or an empty node), and forget the memoized generations
+    def _pruneCaches(self):
+        if len(self._nodes) + len(self._nexts) <= HashLifeGrid.cacheLimit:
+            return
+        nodes, todo = {}, [self.root] + self._empties[1:]
+        while todo:
+            m = todo.pop()
+            key = (m.nw, m.ne, m.sw, m.se)
+            if m.level > 0 and key not in nodes:
+                nodes[key] = m
+                todo.extend(key)
+        self._nodes, self._nexts, self._bounds = nodes, {}, {}
+
+
+    # the one node with given children
+    def _join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = QuadNode(nw, ne, sw, se, nw.level + 1,
+                            nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+
+    def _empty(self, level):
+        while len(self._empties) <= level:
+            e = self._empties[-1]
+            self._empties.append(self._join(e, e, e, e))
+        return self._empties[level]
+
+
+    # the node of given level for the live cells (rows, cols), relative to its nw corner
+    def _build(self, level, rows, cols):
+        if not len(rows):
+            return self._empty(level)
+        if level == 0:
+            return self._alive
+        half = 2**(level - 1)
+        south, east = rows >= half, cols >= half
+        quads = [(~south & ~east), (~south & east), (south & ~east), (south & east)]
+        return self._join(*(self._build(level - 1, rows[q] - half * south[q], cols[q] - half * east[q])
+                            for q in quads))
+
+
+    # the same node, centered in a node twice as large
+    def _expand(self, m):
+        e = self._empty(m.level - 1)
+        return self._join(self._join(e, e, e, m.nw), self._join(e, e, m.ne, e),
+                            self._join(e, m.sw, e, e), self._join(m.se, e, e, e))
+
+
+    # are all live cells within the center half of the center of node m?
+    def _isPadded(self, m):
+        return (m.nw.population == m.nw.se.se.population and m.ne.population == m.ne.sw.sw.population and
+                m.sw.population == m.sw.ne.ne.population and m.se.population == m.se.nw.nw.population)
+
+
+    def _center(self, m):
+        return self._join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw)
+
+
+    # the center of node m (level k >= 2) one generation later, a node of level k-1
+    def _next(self, m):
+        result = self._nexts.get(m)
+        if result is not None:
+            return result
+        if m.population == 0:
+            result = m.nw
+        elif m.level == 2:
+            # 4x4 cells: apply the game rules to the 3x3 neighborhood of each center cell
+            def __cell(r, c):
+                quad = ((m.nw, m.ne), (m.sw, m.se))[r // 2][c // 2]
+                return ((quad.nw, quad.ne), (quad.sw, quad.se))[r % 2][c % 2].population
+            def __nextCell(r, c):
+                index = sum(__cell(r + k // 3 - 1, c + k % 3 - 1) << (8 - k) for k in range(9))
+                return self._alive if GameOfLife.ruleTable[index] else self._dead
+            result = self._join(__nextCell(1, 1), __nextCell(1, 2), __nextCell(2, 1), __nextCell(2, 2))
+        else:
+            # the 9 overlapping nodes of level k-1 covering m (north-west to south-east),
+            # their centers make up 4 nodes of level k-1 around the center of m
+            nw, ne, sw, se = m.nw, m.ne, m.sw, m.se
+            n00, n01, n02 = nw, self._join(nw.ne, ne.nw, nw.se, ne.sw), ne
+            n10, n11, n12 = self._join(nw.sw, nw.se, sw.nw, sw.ne), self._center(m), self._join(ne.sw, ne.se, se.nw, se.ne)
+            n20, n21, n22 = sw, self._join(sw.ne, se.nw, sw.se, se.sw), se
+            c00, c01, c02 = self._center(n00), self._center(n01), self._center(n02)
+            c10, c11, c12 = self._center(n10), self._center(n11), self._center(n12)
+            c20, c21, c22 = self._center(n20), self._center(n21), self._center(n22)
+            result = self._join(self._next(self._join(c00, c01, c10, c11)), self._next(self._join(c01, c02, c11, c12)),
+                                self._next(self._join(c10, c11, c20, c21)), self._next(self._join(c11, c12, c21, c22)))
+        self._nexts[m] = result
+        return result
+
+
+    # (top, left, bottom, right) of the live cells of node m (with some), relative to its nw corner.
+    # memoized per node like _next, so that it costs only for nodes not seen before
+    def _liveBounds(self, m):
+        bounds = self._bounds.get(m)
+        if bounds is not None:
+            return bounds
+        if m.level == 0:
+            bounds = (0, 0, 0, 0)
+        else:
+            half = 2**(m.level - 1)
+            quads = [(self._liveBounds(q), r, c) for q, r, c in
+                        ((m.nw, 0, 0), (m.ne, 0, half), (m.sw, half, 0), (m.se, half, half)) if q.population]
+            bounds = (min(b[0] + r for b, r, c in quads), min(b[1] + c for b, r, c in quads),
+                        max(b[2] + r for b, r, c in quads), max(b[3] + c for b, r, c in quads))
+        self._bounds[m] = bounds
+        return bounds
+
+
+    # (rows, cols) of the live cells under the root
+    def _cells(self):
+        rows, cols = [], []
+        def __collect(m, r, c):
+            if m.population == 0:
+                return
+            if m.level == 0:
+                rows.append(r)
+                cols.append(c)
+                return
+            half = 2**(m.level - 1)
+            __collect(m.nw, r, c)
+            __collect(m.ne, r, c + half)
+            __collect(m.sw, r + half, c)
+            __collect(m.se, r + half, c + half)
+        __collect(self.root, self.top, self.left)
+        return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+#
+###########################################################
 # GameOfLife
 # sets up a game board, initializes it, and plays tick by tick
 ###########################################################
 #
 import os, time
 
+try:
+    import numba
+    from numba import cuda
+except ImportError: # numba is optional, only the numba and cuda backends need it
+    numba, cuda = None, None
+
+if numba is not None:
+    # one tick over a board that has a dead border of 1 cell on each side (as
+    # the Grid boards do); only the inner cells are computed into out.
+    # compiled once, and cached on disk
+    @numba.njit(cache=True, parallel=True)
+    def _stepNumba(board, out):
+        for i in numba.prange(1, board.shape[0] - 1):
+            for j in range(1, board.shape[1] - 1):
+                n = (board[i-1, j-1] + board[i-1, j] + board[i-1, j+1] +
+                     board[i, j-1]                   + board[i, j+1] +
+                     board[i+1, j-1] + board[i+1, j] + board[i+1, j+1])
+                out[i, j] = 1 if n == 3 or (board[i, j] and n == 2) else 0
+
+    # the same kernel, compiled for one shape of the bordered board. the shape
+    # is a compile time constant, so loop bounds are known to the compiler, which
+    # can then fully unroll and vectorize. kernels are kept for the most recently
+    # used shapes only, as each one costs a compile
+    _stepNumbaShaped = {}
+    _stepNumbaShapedMax = 8
+    def _stepNumbaFor(shape):
+        if shape in _stepNumbaShaped:
+            _stepNumbaShaped[shape] = _stepNumbaShaped.pop(shape) # most recently used goes last
+        else:
+            if len(_stepNumbaShaped) >= _stepNumbaShapedMax:
+                _stepNumbaShaped.pop(next(iter(_stepNumbaShaped))) # drop the least recently used
+            R, C = shape
+            @numba.njit("void(uint8[:,:], uint8[:,:])", boundscheck=False, fastmath=True)
+            def _step(board, out):
+                for i in range(1, R - 1):
+                    for j in range(1, C - 1):
+                        n = (board[i-1, j-1] + board[i-1, j] + board[i-1, j+1] +
+                             board[i, j-1]                   + board[i, j+1] +
+                             board[i+1, j-1] + board[i+1, j] + board[i+1, j+1])
+                        out[i, j] = 1 if n == 3 or (board[i, j] and n == 2) else 0
+            _stepNumbaShaped[shape] = _step
+        return _stepNumbaShaped[shape]
+
+    # the same tick as a CUDA kernel, one gpu thread per cell
+    @cuda.jit
+    def _stepCuda(board, out):
+        i, j = cuda.grid(2)
+        if 1 <= i < board.shape[0] - 1 and 1 <= j < board.shape[1] - 1:
+            n = (board[i-1, j-1] + board[i-1, j] + board[i-1, j+1] +
+                 board[i, j-1]                   + board[i, j+1] +
+                 board[i+1, j-1] + board[i+1, j] + board[i+1, j+1])
+            out[i, j] = 1 if n == 3 or (board[i, j] and n == 2) else 0
+
+try:
+    # the same kernel again, as a small C extension built from chargepoint_step.pyx
+    from chargepoint_step import step as _stepCython
+except ImportError: # only the cython backend needs it
+    _stepCython = None
+
+
 class GameOfLife:
-    def __init__(self, extent=[10,20], margins=[2,3,2,3], initialPattern="XX/XX"):
+    # ways to compute a tick. "numpy" works on the uint8 board, "packed" on the
+    # board packed 64 cells to a uint64 word. the board is packed and unpacked
+    # again on every tick, so "packed" is no faster than "numpy" at any size.
+    # "table" looks the next state of each cell up in ruleTable, by its 3x3 neighborhood.
+    # it is a slower reference path (2-5x slower than "numpy"), kept to check the table against.
+    # "numba" runs a compiled kernel over the rows in parallel, needs numba installed.
+    # "numba-shaped" runs kernels compiled for each board shape that stays for
+    # shapedAfterTicks ticks - it pays off once the board shape stops changing
+    # (still lifes, oscillators...).
+    # "cuda" runs the kernel on the gpu, and pays off for grids larger than 256x256.
+    # "cython" runs the kernel built with cython, for when numba is not around.
+    # "sparse" plays on a SparseGrid, and pays off for mostly dead grids.
+    # "hashlife" plays on a HashLifeGrid, and pays off for long runs of repeating patterns
+    backends = ["numpy", "table", "packed", "numba", "numba-shaped", "cuda", "cython", "sparse", "hashlife"]
+    shapedAfterTicks = 20
+    # next state of a cell, for each of the 512 states of its 3x3 neighborhood. the
+    # neighborhood is read row by row into bits 8..0, which puts the cell itself at bit 4
+    ruleTable = np.array([1 if bin(i).count("1") == 3 or (i & 0b10000 and bin(i).count("1") == 4) else 0
+                            for i in range(512)], dtype=np.uint8)
+    def __init__(self, extent=[10,20], margins=[2,3,2,3], initialPattern="XX/XX", backend="numpy"):
         # print(f"GOL extent={extent}, margins={margins}")
-        self.g = Grid("inf", extent, margins)
+        if backend not in GameOfLife.backends:
+            raise ValueError(f"bad backend, only {'/'.join(GameOfLife.backends)} are allowed.")
+        if backend.startswith("numba") and numba is None:
+            raise ValueError(f"{backend} backend needs numba to be installed!")
+        if backend == "cuda" and not (cuda is not None and cuda.is_available()):
+            raise ValueError(f"cuda backend needs numba and a cuda gpu!")
+        if backend == "cython" and _stepCython is None:
+            raise ValueError(f"cython backend needs chargepoint_step.pyx to be built (cythonize -i chargepoint_step.pyx)!")
+        self.g = {"sparse": SparseGrid, "hashlife": HashLifeGrid}.get(backend, Grid)("inf", extent, margins)
         self.g.seedPattern(initialPattern, "center")
         self.tickCount = 0
+        self._nextBoard = {"numpy": self._nextBoardNumpy, "table": self._nextBoardTable,
+                            "packed": self._nextBoardPacked, "numba": self._nextBoardNumba, "numba-shaped": self._nextBoardNumbaShaped,
+                            "cuda": self._nextBoardCuda, "cython": self._nextBoardCython,
+                            "sparse": self._nextBoardSparse, "hashlife": self._nextBoardSparse}[backend]
+        self._wide, self._index = None, None # uint16 scratch boards for the table backend, reallocated when the grid gets resized
+        self._shape, self._shapeTicks = None, 0 # board shape, and for how many ticks, for numba-shaped
+        self._device = None # front and back boards on the gpu, for the cuda backend
+        self._deviceOf = None # the grid front board that the gpu front board is a copy of
 
 
     # todo - add more interesting rendering agents
-    def run(self, tickIntervalMillis, maxTicks, redenrTo="html:filename"):
+    # the board is rendered only every render_every ticks, then waiting for the tick
+    # interval. with sleep=False, ticks are played back to back (e.g. for benchmarks)
+    def run(self, tickIntervalMillis, maxTicks, redenrTo="html:filename", render_every=1, sleep=True):
+        if render_every < 1:
+            raise ValueError(f"bad render_every, must be 1 or more!")
         for t in range(maxTicks):
-            print(f"-------About to tick; already played {self.tickCount} ticks------------")
+            render = (self.tickCount + 1) % render_every == 0
+            if render:
+                print(f"-------About to tick; already played {self.tickCount} ticks------------")
             self.tick()
-            game.renderToConsole()
-            time.sleep(tickIntervalMillis/1000.0)
+            if render:
+                self.renderToConsole()
+                if sleep:
+                    time.sleep(tickIntervalMillis/1000.0)
 
 
     # one round of game play
-    # - grid row by grid row, compute count of alive neighbors for each cell in the row
-    # - compute deaths and births by applying game rules
-    # - apply the transitions to the grid
+    # - compute the next board by applying game rules: a cell is alive next if it
+    #   has 3 alive neighbors, or is alive now and has 2 alive neighbors
+    # - apply the next board to the grid
     def tick(self):
-        # since we have a margin of dead rows and columns all around, 
+        # since we have a margin of dead rows and columns all around,
         # we don't have to worry about creating new rows /  columns here.
-        rowcount, colcount = self.g.getExtent()
-        transitions = []
-        for rownum in range(rowcount):
-            neighbors = self.g.countNeighborsForRow(rownum)
-            row_census = self._determineTransitions(rownum, neighbors)
-            if row_census:
-                # print("at row#", rownum, "- row_census=", row_census)
-                transitions += row_census
         # apply trim only every 5 ticks - so that we can see the moves on display
-        self.g.applyPoints(transitions, self.tickCount and self.tickCount % 5 == 0) 
+        self._nextBoard(self.tickCount and self.tickCount % 5 == 0)
         self.tickCount += 1
 
 
-    # compute deaths and births by applying game rules, given a grid rownum
-    # alive neighbor count for each cell in that row 
-    def _determineTransitions(self, rownum, neighbors):
-        def __dieTest(ncount, colnum):
-            return not (2 <= ncount <= 3) and self.g.isCellAlive(rownum, colnum)
-        def __birthTest(ncount, colnum):
-            return 3 == ncount and not self.g.isCellAlive(rownum, colnum)
-        census = []
-        for colnum in range(len(neighbors)):
-            if __dieTest(neighbors[colnum], colnum):
-                census.append(GridPoint(rownum, colnum, False))
-            elif __birthTest(neighbors[colnum], colnum):
-                census.append(GridPoint(rownum, colnum, True))
-        return census
+    # for the whole grid at once, compute count of alive neighbors for each cell
+    # and apply the rules in one fused expression
+    def _nextBoardNumpy(self, trim_now):
+        neighbors = self.g.countNeighbors()
+        alive = self.g.board.astype(bool)
+        np.bitwise_or(neighbors == 3, alive & (neighbors == 2), out=self.g.back[1:-1, 1:-1], casting="unsafe")
+        self.g.swapBoards(trim_now)
+
+
+    # same rules, with the 3x3 neighborhood of each cell packed into a 9 bit index
+    # (shifting in one neighbor at a time), to look the next state of the cell up
+    # in ruleTable. the index is built in place, in the uint16 scratch boards
+    def _nextBoardTable(self, trim_now):
+        g = self.g
+        rowcount, colcount = g.extent
+        if self._wide is None or self._wide.shape != g.front.shape:
+            self._wide = np.empty(g.front.shape, dtype=np.uint16)
+            self._index = np.empty((rowcount, colcount), dtype=np.uint16)
+        wide, index = self._wide, self._index
+        np.copyto(wide, g.front)
+        np.copyto(index, wide[:rowcount, :colcount])
+        for k in range(1, 9):
+            r, c = divmod(k, 3)
+            np.left_shift(index, 1, out=index)
+            np.bitwise_or(index, wide[r:r+rowcount, c:c+colcount], out=index)
+        np.take(GameOfLife.ruleTable, index, out=g.back[1:-1, 1:-1])
+        g.swapBoards(trim_now)
+
+
+    # same rules, worked 64 cells at a time on the packed board (SWAR).
+    # the 8 neighbor bitplanes are summed up into 3 bitplanes s0,s1,s2 holding
+    # the count mod 8 for each cell; a count of 8 reads as 0, which is dead anyway.
+    # count==3 or (alive and count==2) then is s1 & ~s2 & (s0 | alive)
+    def _nextBoardPacked(self, trim_now):
+        one, top = np.uint64(1), np.uint64(63)
+        def __west(x): # the west neighbor of each cell, carrying across words
+            w = x << one
+            w[:, 1:] |= x[:, :-1] >> top
+            return w
+        def __east(x): # the east neighbor of each cell, carrying across words
+            e = x >> one
+            e[:, :-1] |= x[:, 1:] << top
+            return e
+        alive = self.g.board_packed
+        north, south = np.zeros_like(alive), np.zeros_like(alive)
+        north[1:], south[:-1] = alive[:-1], alive[1:]
+        s0, s1, s2 = np.zeros_like(alive), np.zeros_like(alive), np.zeros_like(alive)
+        for plane in (__west(north), north, __east(north), __west(alive), __east(alive),
+                        __west(south), south, __east(south)):
+            # add the plane to the count, rippling the carry through the bitplanes
+            c0 = s0 & plane
+            s0 ^= plane
+            c1 = s1 & c0
+            s1 ^= c0
+            s2 ^= c1
+        self.g.applyPacked(s1 & ~s2 & (s0 | alive), trim_now)
+
+
+    # same rules, in the compiled kernel working straight on the grid boards
+    def _nextBoardNumba(self, trim_now):
+        _stepNumba(self.g.front, self.g.back)
+        self.g.swapBoards(trim_now)
+
+
+    # same, with the kernel compiled for the current board shape
+    # a shape gets its own kernel only once it has stayed for shapedAfterTicks ticks;
+    # until then (e.g. while a pattern keeps growing) the generic kernel is used
+    def _nextBoardNumbaShaped(self, trim_now):
+        shape = self.g.front.shape
+        self._shapeTicks = self._shapeTicks + 1 if shape == self._shape else 1
+        self._shape = shape
+        if self._shapeTicks > GameOfLife.shapedAfterTicks or shape in _stepNumbaShaped:
+            _stepNumbaFor(shape)(self.g.front, self.g.back)
+        else:
+            _stepNumba(self.g.front, self.g.back)
+        self.g.swapBoards(trim_now)
+
+
+    # same, with the kernel run on the gpu. the boards stay on the gpu across
+    # ticks, and are swapped there; they are copied to the gpu again only when
+    # the grid boards have been replaced (resized). each new board is copied
+    # back, as the margins are maintained on the host
+    def _nextBoardCuda(self, trim_now):
+        if self.g.front is not self._deviceOf:
+            self._device = (cuda.to_device(np.ascontiguousarray(self.g.front)),
+                            cuda.to_device(np.zeros_like(self.g.front)))
+        front, back = self._device
+        threads = (16, 16)
+        blocks = tuple(-(-n // t) for n, t in zip(front.shape, threads))
+        _stepCuda[blocks, threads](front, back)
+        self._device = (back, front)
+        self.g.back[:] = back.copy_to_host()
+        self._deviceOf = self.g.back # unless the grid gets resized, this becomes the front board
+        self.g.swapBoards(trim_now)
+
+
+    # same rules, in the kernel built with cython
+    def _nextBoardCython(self, trim_now):
+        _stepCython(self.g.front, self.g.back)
+        self.g.swapBoards(trim_now)
+
+
+    # same rules, played on the live cells of a SparseGrid (or a HashLifeGrid). it has no margins to trim
+    def _nextBoardSparse(self, trim_now):
+        self.g.step()
 
 
     # render game board on console - use curses?? nope
@@ -341,6 +939,144 @@ class GameOfLife:
 
 import pytest
 
+# the live cells of a board, as a set of (row,col) relative to their bounding box
+def _liveCells(board):
+    rows, cols = np.nonzero(board)
+    return _relativeCells(set(zip(rows.tolist(), cols.tolist())))
+
+def _relativeCells(live):
+    if not live:
+        return set()
+    top, left = min(r for r, c in live), min(c for r, c in live)
+    return set((r - top, c - left) for r, c in live)
+
+# plain game rules on a set of live cells, to check the backends against
+def _referenceTick(live):
+    counts = {}
+    for r, c in live:
+        for dr, dc in Grid.directions:
+            counts[(r+dr, c+dc)] = counts.get((r+dr, c+dc), 0) + 1
+    return set(p for p, n in counts.items() if n == 3 or (n == 2 and p in live))
+
+gTestPatterns = list(gPatternDict.values()) + [".X.X.../..X..../XXX..X./.X..X../.....XX/.XXXXX.",
+                "XX.X.XX/X..XX../.XX..XX/X.X.X.X/..XXX.X"]
+
+# the dense backends play on the bordered boards, and have to keep playing right
+# across the ticks where margins get trimmed (every 5th tick)
+@pytest.mark.parametrize("backend", ["numpy", "table", "packed", "numba", "numba-shaped", "cython"])
+@pytest.mark.parametrize("extent, margins", [([25,25], [2,3,2,3]), ([7,9], [3,1,2,4])])
+@pytest.mark.parametrize("pattern", gTestPatterns)
+def test_denseBackendAcrossTrims(backend, extent, margins, pattern):
+    if backend.startswith("numba") and numba is None:
+        pytest.skip("numba is not installed")
+    if backend == "cython" and _stepCython is None:
+        pytest.skip("chargepoint_step.pyx is not built")
+    game = GameOfLife(extent=list(extent), margins=list(margins), initialPattern=pattern, backend=backend)
+    live = _liveCells(game.g.board)
+    for t in range(40):
+        game.tick()
+        live = _referenceTick(live)
+        assert _liveCells(game.g.board) == _relativeCells(live), f"tick# {game.tickCount}"
+        assert not game.g.front[[0, -1], :].any() and not game.g.front[:, [0, -1]].any(), f"tick# {game.tickCount}"
+        assert game.g.front.flags.c_contiguous and game.g.back.flags.c_contiguous, f"tick# {game.tickCount}"
+
+# a pattern larger than the grid has the grid grow to hold it, instead of
+# wrapping around the edges of the board
+@pytest.mark.parametrize("pattern", ["XX" + "."*25, "X/X/" + "./"*25, "X"*30])
+def test_denseGridHoldsLargePattern(pattern):
+    game = GameOfLife(extent=[7,9], margins=[3,1,2,4], initialPattern=pattern, backend="numpy")
+    live = _liveCells(Pattern(pattern).mask)
+    assert _liveCells(game.g.board) == live
+    g = game.g
+    assert g.live_top >= 3 and g.live_right <= g.extent[1] - 2 and g.live_bottom <= g.extent[0] - 3 and g.live_left >= 4
+    for t in range(10):
+        game.tick()
+        live = _referenceTick(live)
+        assert _liveCells(game.g.board) == _relativeCells(live), f"tick# {game.tickCount}"
+
+def test_applyPointsOffTheGrid():
+    g = Grid("inf", [7,9], [2,3,2,3])
+    for rows, cols in [([-1], [3]), ([3], [9])]:
+        with pytest.raises(ValueError):
+            g.applyPoints(np.array(rows), np.array(cols), 1)
+
+# sparse plays the plain rules on the live cells wherever they go, also off to
+# negative rows and columns (the last pattern is a glider running north-west)
+@pytest.mark.parametrize("pattern", gTestPatterns + ["XXX/X../.X."])
+def test_sparseMatchesReference(pattern):
+    game = GameOfLife(extent=[25,25], initialPattern=pattern, backend="sparse")
+    live = set(zip(game.g.rows.tolist(), game.g.cols.tolist()))
+    for t in range(100):
+        game.tick()
+        live = _referenceTick(live)
+        assert set(zip(game.g.rows.tolist(), game.g.cols.tolist())) == live, f"tick# {game.tickCount}"
+
+# the sparse grids tell cells and extent in the frame of the displayed grid, as Grid does
+@pytest.mark.parametrize("backend", ["sparse", "hashlife"])
+@pytest.mark.parametrize("pattern", ["XX/XX", gPatternDict["glider"], "."])
+def test_sparseCellsInDisplayFrame(backend, pattern):
+    game = GameOfLife(extent=[25,25], initialPattern=pattern, backend=backend)
+    for t in range(3):
+        board = game.g.board
+        assert game.g.getExtent() == list(board.shape)
+        assert all(game.g.isCellAlive(r, c) == bool(board[r, c]) for r in range(board.shape[0]) for c in range(board.shape[1]))
+        game.tick()
+
+# hashlife plays the same as sparse, also for patterns larger than the grid
+@pytest.mark.parametrize("pattern", gTestPatterns + ["."*40 + "XXX", "X"*30])
+def test_hashlifeMatchesSparse(pattern):
+    sparse = GameOfLife(extent=[25,25], initialPattern=pattern, backend="sparse")
+    hashlife = GameOfLife(extent=[25,25], initialPattern=pattern, backend="hashlife")
+    for t in range(40):
+        sparse.tick()
+        hashlife.tick()
+        assert str(hashlife.g) == str(sparse.g), f"tick# {sparse.tickCount}"
+
+# hashlife ticks without collecting the live cells from the quadtree, until they are displayed
+def test_hashlifeCollectsCellsOnDisplay(monkeypatch):
+    game = GameOfLife(extent=[25,25], initialPattern=gPatternDict["expanding"], backend="hashlife")
+    collected = []
+    cells = HashLifeGrid._cells
+    monkeypatch.setattr(HashLifeGrid, "_cells", lambda g: collected.append(g) or cells(g))
+    for t in range(100):
+        game.tick()
+    assert not collected
+    str(game.g)
+    str(game.g)
+    assert len(collected) == 1
+
+# the hashlife root stays about as large as the live cells span, and its caches stay
+# bounded, also for a glider running off for thousands of ticks
+@pytest.mark.parametrize("cacheLimit", [HashLifeGrid.cacheLimit, 200])
+def test_hashlifeStaysBounded(monkeypatch, cacheLimit):
+    monkeypatch.setattr(HashLifeGrid, "cacheLimit", cacheLimit)
+    sparse = GameOfLife(extent=[25,25], initialPattern=gPatternDict["glider"], backend="sparse")
+    hashlife = GameOfLife(extent=[25,25], initialPattern=gPatternDict["glider"], backend="hashlife")
+    for t in range(3000):
+        sparse.tick()
+        hashlife.tick()
+        assert hashlife.g.root.level <= 5, f"tick# {hashlife.tickCount}"
+        assert len(hashlife.g._nodes) + len(hashlife.g._nexts) <= cacheLimit, f"tick# {hashlife.tickCount}"
+    assert str(hashlife.g) == str(sparse.g)
+
+# run renders only every render_every-th tick, and waits the tick interval only after
+# a render, and not at all with sleep=False
+@pytest.mark.parametrize("render_every, sleep", [(1, True), (3, True), (3, False)])
+def test_runRenderEvery(monkeypatch, capsys, render_every, sleep):
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    game = GameOfLife(initialPattern=gPatternDict["blink"])
+    game.run(250, 10, "console", render_every=render_every, sleep=sleep)
+    rendered = [int(line.split()[3]) for line in capsys.readouterr().out.splitlines() if line.startswith("Board after tick#")]
+    assert rendered == list(range(render_every, 11, render_every))
+    assert sleeps == ([0.25] * len(rendered) if sleep else [])
+    assert game.tickCount == 10
+
+@pytest.mark.parametrize("render_every", [0, -1])
+def test_runBadRenderEvery(render_every):
+    with pytest.raises(ValueError):
+        GameOfLife().run(0, 1, "console", render_every=render_every)
+
 #################################################################
 import argparse
 def getopts():
@@ -349,16 +1085,21 @@ def getopts():
     parser.add_argument("--pattern", default="glider", help="pattern or name to use")
     parser.add_argument("--num-ticks", type=int, default=60, help="how many ticks to play")
     parser.add_argument("--tick-interval", type=int, default=1000, help="tick interval in millis")
+    parser.add_argument("--render-every", type=int, default=1, help="render the board only every so many ticks")
+    parser.add_argument("--no-sleep", action="store_true", help="play ticks back to back, without waiting for the tick interval")
+    parser.add_argument("--backend", choices=GameOfLife.backends, default="numpy", help="how to compute the ticks. table and packed are slower reference paths. numba, cuda and cython pay off for large boards, sparse for mostly dead boards, hashlife for repeating patterns")
     parser.add_argument("--render-to", choices=["console", "html"], default="console", help="where to render grid. only console is supported for now")
     opts = parser.parse_args()
     return opts
 
 if __name__ == "__main__":
+    print("Hello, chargepoint!")
     opts = getopts()
     print(f"Welcome to Game of Life: will run pattern {repr(opts.pattern)} " +
             " for {opts.num_ticks} ticks once every {opts.tick_interval} millis")
-    game = GameOfLife(extent=[25,25], initialPattern=gPatternDict.get(opts.pattern, opts.pattern))
+    game = GameOfLife(extent=[25,25], initialPattern=gPatternDict.get(opts.pattern, opts.pattern),
+                        backend=opts.backend)
     print("==========INITIAL BOARD===========")
     game.renderToConsole()
-    game.run(opts.tick_interval, opts.num_ticks, "consolde")
+    game.run(opts.tick_interval, opts.num_ticks, "consolde", render_every=opts.render_every, sleep=not opts.no_sleep)
     print("Goodbye")
\ No newline at end of file
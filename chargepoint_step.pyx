@@ -0,0 +1,31 @@
+# cython: language_level=3
+"""
+ChargePoint demo Game of Life - compiled tick
+
+One tick over a board that has a dead border of 1 cell on each
+side (as the Grid boards do); only the inner cells are computed
+into out. This is the same kernel as the numba backend's, for
+when numba is not around. Build it in place with
+
+    cythonize -i chargepoint_step.pyx
+
+and run chargepoint_demo.py with --backend cython.
+"""
+
+cimport cython
+
+# the Grid keeps its boards C-contiguous, so that with contiguous
+# memoryviews the compiler can vectorize the inner loop
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def step(unsigned char[:, ::1] board, unsigned char[:, ::1] out):
+    cdef Py_ssize_t i, j
+    cdef Py_ssize_t R = board.shape[0], C = board.shape[1]
+    # n fits a byte, and the rules are applied without branches
+    cdef unsigned char n
+    for i in range(1, R - 1):
+        for j in range(1, C - 1):
+            n = (board[i-1, j-1] + board[i-1, j] + board[i-1, j+1] +
+                 board[i, j-1]                   + board[i, j+1] +
+                 board[i+1, j-1] + board[i+1, j] + board[i+1, j+1])
+            out[i, j] = (n == 3) | (board[i, j] & (n == 2))